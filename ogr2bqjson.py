@@ -1,14 +1,53 @@
 import argparse
-import json
+import base64
+import functools
+import multiprocessing
 import os
+import queue
+import re
 import sys
-from typing import Tuple
+import threading
+from typing import BinaryIO, Iterable, Iterator, Tuple
 
-import ndjson
-from osgeo import gdal
+import orjson
+from osgeo import gdal, ogr, osr
+
+# ogr and osr need their own calls: without them, a geometry that fails to be
+# transformed is left in the source reference system without an error.
+gdal.UseExceptions()
+ogr.UseExceptions()
+osr.UseExceptions()
 
 reserved_convert_options = ['-f', '-of', '-t_srs']
 default_column_names = ['geometry', 'geojson', 'geojson_geometry']
+# Extensions of common formats that gdal supports, which don't need to be
+# opened to know that they are supported geofiles. .json is left out because it
+# is also the extension of the converted files.
+supported_extensions = {
+  '.fgb', '.geojson', '.geojsonl', '.geojsons', '.gml', '.gpkg', '.kml',
+  '.shp', '.tab',
+}
+# Buffer size, in bytes, for reading and writing the (potentially very large)
+# GeoJSONSeq and newline-delimited JSON files.
+file_buffer_size = 1 << 20
+# Number of rows serialized before they are handed to the writer thread, and
+# the number of those chunks that can wait to be written.
+rows_per_chunk = 1000
+max_queued_chunks = 16
+
+# Code of the BigQuery datatype for each Python type a GeoJSON property value
+# can have. Values of any other type (None, lists, objects) are UNKNOWN. The
+# codes are ordered so that the larger of two codes is the type that can hold
+# the values of both: UNKNOWN < BOOLEAN < INTEGER < FLOAT < STRING.
+type_codes = {
+  type(None): 0,
+  bool: 1,
+  int: 2,
+  float: 3,
+  str: 4,
+}
+type_labels = ['UNKNOWN', 'BOOLEAN', 'INTEGER', 'FLOAT', 'STRING']
+string_type_code = type_codes[str]
 
 
 def main():
@@ -58,8 +97,10 @@ def main():
     )
 
     if not args.skip_schemas:
-      path_root = os.path.splitext(output_filepath)[0]
-      save_schema(schema, path_root, can_overwrite=args.force_overwrite)
+      save_schema(
+        schema,
+        get_schema_filepath(output_filepath, can_overwrite=args.force_overwrite)
+      )
 
 
 def get_args_parser() -> argparse.ArgumentParser:
@@ -92,13 +133,13 @@ def add_args_to_parser(parser: argparse.ArgumentParser) -> None:
     'option is required if the path is to a directory.'
   ))
   parser.add_argument('-f', '--force_overwrite', action='store_true', help=(
-		'Overwrite files if they already exist, otherwise an underscore and number '
-    '("_n") will be appended to the output file\'s name: duplicate_01.json, '
-    'duplicate_02.json, etc.'
+		'Overwrite files if they already exist, otherwise an underscore and the '
+    'lowest unused number ("_nn") will be appended to the output file\'s name: '
+    'duplicate_01.json, duplicate_02.json, etc.'
 	))
   parser.add_argument('-k', '--keep_geojsonseq', action='store_true', help=(
-		'Do not delete the GeoJSONSeq files created when a source file is not '
-    'GeoJSONSeq with a WGS84 reference system. They will be saved with the same '
+		'Create and keep a GeoJSONSeq file when a source file is not GeoJSONSeq '
+    'with a WGS84 reference system. They will be saved with the same '
     'name and location as the json file, but end with _GeoJSONSeq.geojson. Note: '
     'the --force_overwrite / -f option is ignored for the GeoJSONSeq file. It '
     'will never overwrite an existing file, and will be given a unique name.'
@@ -241,7 +282,7 @@ def get_path_parts(path: str) -> dict:
       dict: Dictionary keyed by the path parts.
   """
   path_root, extension = os.path.splitext(path)
-  filename_root = os.path.splitext(os.path.basename(path))[0]
+  filename_root = os.path.basename(path_root)
   source = {
     'extension': extension,
     'filename_root': filename_root,
@@ -254,14 +295,20 @@ def get_path_parts(path: str) -> dict:
 def is_supported_geofile(filepath: str) -> bool:
   """Determine if a file can be opened by gdal.
 
+  Files with one of the supported_extensions are assumed to be supported
+  without opening them.
+
   Args:
       filepath (str): Path to the file
 
   Returns:
       bool: True if the file can be opened, False if can't be opened or missing.
   """
+  if (get_path_parts(filepath)['extension'].lower() in supported_extensions
+      and os.path.isfile(filepath)):
+    return True
+
   try:
-    gdal.UseExceptions()
     gdal.OpenEx(filepath)
     return True
   except Exception:
@@ -390,7 +437,7 @@ def get_columns( columns_args: str ) -> dict:
           'be included in the schema.')
     return {}
   try:
-    user_columns = json.loads(columns_args)
+    user_columns = orjson.loads(columns_args)
   except Exception as err:
     print('Invalid Columns: An error occurred when attempting to parse the '
           f'value for --columns / -c: "{err}". Make sure you entered valid JSON '
@@ -450,43 +497,111 @@ def convert_all(
     target_extension = '.' + target_extension
 
   if not source_directory.endswith('/'):
-    source_directory += source_directory + '/'
+    source_directory += '/'
 
   output_directory = output_directory or source_directory
   print((
     f'converting all {target_extension} files in {source_directory} and saving '
     f'them to {output_directory}...'
   ))
-  for file in os.listdir(source_directory):
-    if os.path.splitext(file)[1] == target_extension:
-      full_filename = os.fsdecode(file)
-      source_filepath = os.path.join(source_directory, full_filename)
-
-      output_filepath, schema = convert_to_ndjson(
-        source_filepath,
-        columns=columns,
-        convert_options=convert_options,
-        output_directory=output_directory,
+  source_filepaths = []
+  with os.scandir(source_directory) as entries:
+    for entry in entries:
+      # Not limited to files: some formats, like FileGDB, are directories.
+      if os.path.splitext(entry.name)[1] == target_extension:
+        source_filepaths.append(entry.path)
+
+  if not source_filepaths:
+    return
+
+  # Choose every output and schema filepath before any file is written, so a
+  # name picked for one file (foo_01.json) can't also be picked for another.
+  reserved_filepaths = set()
+  conversions = []
+  for source_filepath in source_filepaths:
+    output_filepath = get_output_filepath(
+      source_filepath,
+      '.json',
+      can_overwrite=can_overwrite,
+      output_directory=output_directory,
+      reserved_filepaths=reserved_filepaths
+    )
+    reserved_filepaths.add(output_filepath)
+    schema_filepath = None
+    if not skip_schemas:
+      schema_filepath = get_schema_filepath(
+        output_filepath,
         can_overwrite=can_overwrite,
-        do_keep_geojsonseq=do_keep_geojsonseq
+        reserved_filepaths=reserved_filepaths
       )
+      reserved_filepaths.add(schema_filepath)
+    conversions.append((source_filepath, output_filepath, schema_filepath))
+
+  # Each file is converted independently, so spread them across processes.
+  convert = functools.partial(
+    convert_file,
+    columns=columns,
+    convert_options=convert_options,
+    do_keep_geojsonseq=do_keep_geojsonseq,
+    output_directory=output_directory,
+  )
+  processes = min(len(conversions), os.cpu_count() or 1)
+  with multiprocessing.Pool(processes=processes) as pool:
+    pool.starmap(convert, conversions)
+
+
+def convert_file(
+    source_filepath: str,
+    output_filepath: str,
+    schema_filepath: str | None = None,
+    columns: dict | None = None,
+    convert_options:str | None = None,
+    do_keep_geojsonseq: bool | None = False,
+    output_directory: str | None = None, ) -> None:
+  """Convert a file to newline delimited JSON and save its schema.
 
-      if (not skip_schemas):
-        path_root = os.path.splitext(output_filepath)[0]
-        save_schema(schema, path_root, can_overwrite=can_overwrite)
+  This is called by convert_all() for each file in the source directory, in a
+  separate process.
+
+  Args:
+      source_filepath (str): Path to the file to convert
+      output_filepath (str): Path to save the converted file to
+      schema_filepath (str | None, optional): Path to save the schema file to.
+        The schema is not saved if None. Defaults to None.
+      columns (dict | None, optional): The column(s) to place the geographic
+        features in. See geojson_to_ndjson() for more info. Defaults to None.
+      convert_options (str | None, optional): Options to pass to gdal. See
+        convert_to_wgs84_geojsonseq() For more info. Defaults to None.
+      do_keep_geojsonseq (bool | None, optional): Does not delete the temporary
+        GeoJSONSeq file. Defaults to False.
+      output_directory (str | None, optional): Path to the directory to save
+        the temporary GeoJSONSeq file to. If omitted, it will be saved in the
+        output file's directory. Defaults to None.
+  """
+  output_filepath, schema = convert_to_ndjson(
+    source_filepath,
+    columns=columns,
+    convert_options=convert_options,
+    output_directory=output_directory,
+    do_keep_geojsonseq=do_keep_geojsonseq,
+    output_filepath=output_filepath
+  )
+
+  if schema_filepath:
+    save_schema(schema, schema_filepath)
 
 
 def get_safe_filepath(
     initial_filepath:str,
     can_overwrite: bool | None = False,
-    is_candidate: bool | None = True) -> str:
+    is_candidate: bool | None = True,
+    reserved_filepaths: set | None = None) -> str:
   """Find a filepath to write to starting with an initial filepath.
 
     If a file exists at the initial location, and it is not safe to overwrite
-    it, or the initial filepath is not a candidate, then "_01" will be appended
-    to the filename (foo/bar_01.json), and the filepath of the new candidate
-    will be checked. The process repeats, incrementing the number by one, until
-    a unique filepath is found: foo/bar_02.json, foo/bar_03.json, etc.
+    it, or the initial filepath is not a candidate, then an underscore and the
+    lowest number not already used in the directory will be appended to the
+    filename: foo/bar_01.json, foo/bar_02.json, etc.
 
     Note: This does not check the OS permissions on the file or directory.
 
@@ -496,45 +611,112 @@ def get_safe_filepath(
         overwrite existing files. Defaults to False.
       is_candidate (bool | None, optional): Whether the initial filepath should
         be evaluated. Defaults to True.
+      reserved_filepaths (set | None, optional): Filepaths that will be written
+        to but may not exist yet. They are never chosen, even if can_overwrite
+        is True. Defaults to None.
 
   Returns:
       str: The path to the file
   """
-  path_root, extension = os.path.splitext(initial_filepath)
-  i = 0
-  if not is_candidate:
-    i = 1
-    initial_filepath = f'{path_root}_01{extension}'
-
-  while not is_output_file_safe(initial_filepath, can_overwrite):
+  reserved_filepaths = reserved_filepaths or set()
+  path_parts = get_path_parts(initial_filepath)
+  path_root = path_parts['path_root']
+  extension = path_parts['extension']
+  if (is_candidate
+      and initial_filepath not in reserved_filepaths
+      and is_output_file_safe(initial_filepath, can_overwrite)):
+    return initial_filepath
+  if can_overwrite and f'{path_root}_01{extension}' not in reserved_filepaths:
+    return f'{path_root}_01{extension}'
+
+  # List the directory once instead of checking each candidate for existence.
+  directory = os.path.dirname(path_root)
+  pattern = re.compile(
+    re.escape(path_parts['filename_root']) + r'_(\d{2,})' + re.escape(extension) + '$')
+  try:
+    filenames = os.listdir(directory or '.')
+  except FileNotFoundError:
+    filenames = []
+  filenames += [
+    os.path.basename(filepath) for filepath in reserved_filepaths
+    if os.path.dirname(filepath) == directory
+  ]
+
+  used_numbers = set()
+  for filename in filenames:
+    match = pattern.match(filename)
+    # Only count numbers written the way this function writes them, so
+    # bar_001.json is not mistaken for bar_01.json.
+    if match and match.group(1) == f'{int(match.group(1)):02d}':
+      used_numbers.add(int(match.group(1)))
+
+  i = 1
+  while i in used_numbers:
     i += 1
-    initial_filepath = f'{path_root}_{i:02d}{extension}'
 
-  return initial_filepath
+  return f'{path_root}_{i:02d}{extension}'
 
 
-def is_wgs84_geojsonseq(filepath: str) -> bool:
-  """Determine if a file is encoded as GeoJSONSeq with a WGS84 reference system.
+def is_wgs84_geojsonseq(ds: gdal.Dataset) -> bool:
+  """Determine if a dataset is encoded as GeoJSONSeq with a WGS84 reference system.
 
-  It is recommended to check that the file exists and is a supported geographic
-    features file before calling this function. There is no exception handling,
-    by design, so that it isn't ambiguous whether a returned value is falsy
-    because the file has a different encoding/reference system, or there was an
-    error opening it.
+  There is no exception handling, by design, so that it isn't ambiguous whether
+    a returned value is falsy because the file has a different encoding/reference
+    system, or there was an error reading it.
 
   Args:
-      filepath (str): Path to the file
+      ds (gdal.Dataset): The file, opened with gdal.OpenEx()
 
   Returns:
       bool: True if the file is in the correct format, False if it is not.
   """
-  gdal.UseExceptions()
-  ds=gdal.OpenEx(filepath)
-
   return (ds.GetDriver().GetDescription() == 'GeoJSONSeq'
           and ds.GetLayer().GetSpatialRef().GetName() == 'WGS 84')
 
 
+def sniff_wgs84_geojsonseq(filepath: str) -> bool | None:
+  """Guess whether a file is WGS84 GeoJSONSeq from its first line.
+
+  The file is GeoJSONSeq if its first line is a complete GeoJSON Feature
+  object. Features without a "crs" member are WGS84 (see RFC 7946). Record
+  separator delimited GeoJSONSeq (RFC 8142) is reported as not being
+  GeoJSONSeq, since geojson_to_ndjson() can't parse it.
+
+  Args:
+      filepath (str): Path to the file
+
+  Returns:
+      bool | None: True if the file is WGS84 GeoJSONSeq, False if it is not,
+        None if it can't be determined without opening it with gdal.
+  """
+  # Directory datasets, like FileGDB, are left for gdal to identify.
+  if not os.path.isfile(filepath):
+    return None
+
+  with open(filepath, 'rb') as file:
+    head = file.read(4096)
+
+  head = head.lstrip()
+  if not head.startswith(b'{'):
+    return False
+
+  first_line, newline, _ = head.partition(b'\n')
+  if not newline:
+    # The first line is longer than what was read, or the file has one line.
+    return None
+
+  try:
+    feature = orjson.loads(first_line)
+  except orjson.JSONDecodeError:
+    # A line that isn't a complete JSON object, like pretty-printed GeoJSON.
+    return False
+
+  if not isinstance(feature, dict) or feature.get('type') != 'Feature':
+    return False
+
+  return None if 'crs' in feature else True
+
+
 def geojson_to_ndjson(
     geojsonseq_filepath: str,
     output_filepath: str,
@@ -561,82 +743,303 @@ def geojson_to_ndjson(
     f'Converting GeoJSONSeq file at {geojsonseq_filepath} to ndjson and saving to '
     f'{output_filepath}...'
   ))
-  rows = []
-  schema = {}
+  with open(geojsonseq_filepath, 'rb', buffering=file_buffer_size) as geojson_file:
+    return features_to_ndjson(
+      (orjson.loads(line) for line in geojson_file),
+      output_filepath,
+      columns=columns
+    )
 
-  with open(geojsonseq_filepath, "r") as geojson_file:
-    for line in geojson_file:
-      row = {}
-      line_item = ndjson.loads(line)[0]
-      properties = line_item.get('properties', {})
-
-      for key in properties:
-        value = properties[key]
-        row[key] = value
-        schema[key] = get_column_type(value, schema.get(key))
-
-      if 'geometry' in columns:
-        row[columns['geometry']] = json.dumps(line_item['geometry'], ensure_ascii=False)
-      if 'geojson' in columns:
-        row[columns['geojson']] = json.dumps(line_item, ensure_ascii=False)
-      if 'geojson_geometry' in columns:
-        row[columns['geojson_geometry']] = json.dumps(line_item['geometry'], ensure_ascii=False)
-      rows.append(row)
-
-  if 'geometry' in columns:
-      schema[columns['geometry']] = 'GEOGRAPHY'
-  if 'geojson' in columns:
-      schema[columns['geojson']] = 'STRING'
-  if 'geojson_geometry' in columns:
-      schema[columns['geojson_geometry']] = 'STRING'
-
-  with open(output_filepath, 'w+') as json_file:
-    ndjson.dump(rows, json_file)
 
-  return schema
+def ogr_to_ndjson(
+    ds: gdal.Dataset,
+    output_filepath: str,
+    columns: dict | None = {'geometry':'geometry','geojson':'geojson'}) -> dict:
+  """Convert a geographic features file to newline-delimited JSON.
+
+  Features are read from the file's first layer and their geometries are
+  transformed to WGS84 as they are read, without creating an intermediary
+  GeoJSONSeq file. Use convert_to_ndjson() instead of calling this directly.
+
+  Args:
+      ds (gdal.Dataset): The features file, opened with gdal.OpenEx()
+      output_filepath (str): Path to save the nd JSON file
+      columns (dict | None, optional): The column(s) to place the geographic
+        features in. See geojson_to_ndjson() for more info. Defaults to
+        {'geometry':'geometry','geojson':'geojson'}.
+
+  Returns:
+      dict: Schema of the exported file
+  """
+  print(f'Converting {ds.GetDescription()} to ndjson and saving to {output_filepath}...')
+  layer = ds.GetLayer()
+  return features_to_ndjson(
+    get_transformed_features(layer, get_wgs84_transformation(layer)),
+    output_filepath,
+    columns=columns
+  )
+
+
+def get_wgs84_transformation(layer: ogr.Layer) -> osr.CoordinateTransformation | None:
+  """Build the transformation from a layer's reference system to WGS84.
+
+  The transformation is built once per layer, and reprojects all of a
+  geometry's points in a single call to Transform().
+
+  Args:
+      layer (ogr.Layer): Layer whose features will be transformed
+
+  Returns:
+      osr.CoordinateTransformation | None: The transformation, or None if the
+        layer already uses WGS84 with longitude/latitude axis order.
+  """
+  source_srs = layer.GetSpatialRef()
+  wgs84 = osr.SpatialReference()
+  wgs84.ImportFromEPSG(4326)
+  wgs84.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+  if (source_srs is not None
+      and source_srs.IsSame(wgs84)
+      and (source_srs.GetAxisMappingStrategy()
+           == osr.OAMS_TRADITIONAL_GIS_ORDER)):
+    return None
+
+  return osr.CoordinateTransformation(source_srs, wgs84)
+
+
+def get_transformed_features(
+    layer: ogr.Layer,
+    transformation: osr.CoordinateTransformation | None) -> Iterator[dict]:
+  """Yield a layer's features as GeoJSON objects with transformed geometries.
+
+  Args:
+      layer (ogr.Layer): Layer to read the features from
+      transformation (osr.CoordinateTransformation | None): Transformation to
+        apply to each feature's geometry. Geometries are not changed if None.
+
+  Yields:
+      Iterator[dict]: The feature as a GeoJSON Feature object, with the
+        geometry already serialized by OGR as an orjson.Fragment.
+  """
+  # feature.items() returns some field types differently than the GeoJSONSeq
+  # driver writes them, so find those fields once for the whole layer.
+  layer_defn = layer.GetLayerDefn()
+  date_fields = []
+  string_fields = []
+  binary_fields = []
+  for i in range(layer_defn.GetFieldCount()):
+    field_defn = layer_defn.GetFieldDefn(i)
+    field_type = field_defn.GetType()
+    if field_type in (ogr.OFTDate, ogr.OFTTime, ogr.OFTDateTime):
+      date_fields.append((i, field_defn.GetName(), field_type))
+    elif field_type == ogr.OFTString:
+      string_fields.append(field_defn.GetName())
+    elif field_type == ogr.OFTBinary:
+      binary_fields.append(field_defn.GetName())
+
+  for feature in layer:
+    geometry = feature.GetGeometryRef()
+    if geometry is None:
+      geometry_json = None
+    else:
+      if transformation is not None:
+        geometry.Transform(transformation)
+      geometry_json = orjson.Fragment(geometry.ExportToJson())
+
+    properties = feature.items()
+    # Dates are returned like "2020/01/02", which BigQuery can't load.
+    for i, name, field_type in date_fields:
+      if feature.IsFieldSetAndNotNull(i):
+        properties[name] = get_iso8601_datetime(
+          feature.GetFieldAsDateTime(i),
+          field_type
+        )
+    # Strings that aren't valid UTF-8 are returned as bytes. Like the GeoJSON
+    # drivers, replace their non-ASCII characters with "?".
+    for name in string_fields:
+      value = properties[name]
+      if type(value) is bytes:
+        properties[name] = value.decode('ascii', 'replace').replace('\ufffd', '?')
+    # Like the GeoJSON drivers, write binary fields base64 encoded.
+    for name in binary_fields:
+      value = properties[name]
+      if type(value) is bytes:
+        properties[name] = base64.b64encode(value).decode('ascii')
+
+    # Same members, in the same order, as the features written by the
+    # GeoJSONSeq driver. The FID is left out, like ogr2ogr does by default.
+    yield {
+      'type': 'Feature',
+      'properties': properties,
+      'geometry': geometry_json,
+    }
+
+
+def get_iso8601_datetime(datetime_parts: list, field_type: int) -> str:
+  """Format the value of an OGR date, time or datetime field as ISO 8601.
+
+  Args:
+      datetime_parts (list): Value returned by ogr.Feature.GetFieldAsDateTime():
+        year, month, day, hour, minute, second and time zone flag.
+      field_type (int): ogr.OFTDate, ogr.OFTTime or ogr.OFTDateTime
 
+  Returns:
+      str: The value formatted like "2020-01-02", "10:00:00" or
+        "2020-01-02T10:00:00.500+01:00", depending on the field type.
+  """
+  year, month, day, hour, minute, second, tz_flag = datetime_parts
+  date = f'{year:04d}-{month:02d}-{day:02d}'
+  if field_type == ogr.OFTDate:
+    return date
+
+  if second == int(second):
+    time = f'{hour:02d}:{minute:02d}:{int(second):02d}'
+  else:
+    time = f'{hour:02d}:{minute:02d}:{second:06.3f}'
+  if field_type == ogr.OFTTime:
+    return time
 
-def get_column_type(
-    value: str | int | float | bool,
-    last_type: str | None = None) -> str:
-  """Match a value's type to a BigQuery datatype.
+  # The time zone flag is 0 if unknown, 1 for local time, and otherwise 100
+  # plus the offset from UTC in 15 minute increments.
+  time_zone = ''
+  if tz_flag == 100:
+    time_zone = 'Z'
+  elif tz_flag > 1:
+    offset = abs(tz_flag - 100) * 15
+    sign = '+' if tz_flag > 100 else '-'
+    time_zone = f'{sign}{offset // 60:02d}:{offset % 60:02d}'
 
-  The last_type argument is for making sure the correct type for a column is
-  found when using values from multiple rows. For example, if the value for a
-  column in the first row is None, then the last_type for that column would be
-  "UNKNOWN" until a row with an actual value in the column is reached. Another
-  example is if the value for a column in the first row is an integer, then the
-  last_type would be "INTEGER". But if in another row the column has a float,
-  then the datatype for the column should be "FLOAT", since no precision/data
-  is lost when inserting an integer into a float column.
+  return f'{date}T{time}{time_zone}'
+
+
+def features_to_ndjson(
+    features: Iterable[dict],
+    output_filepath: str,
+    columns: dict | None = {'geometry':'geometry','geojson':'geojson'}) -> dict:
+  """Write GeoJSON Feature objects to a newline-delimited JSON file.
 
   Args:
-      value (str | int | float | bool): Value to match
-      last_type (str | None, optional): Previous type detected for same
-        kind/source of variable.
+      features (Iterable[dict]): GeoJSON Feature objects with WGS84 geometries.
+        The geometry can be a dict, or an orjson.Fragment of its JSON.
+      output_filepath (str): Path to save the nd JSON file
+      columns (dict | None, optional): The column(s) to place the geographic
+        features in. See geojson_to_ndjson() for more info. Defaults to
+        {'geometry':'geometry','geojson':'geojson'}.
 
   Returns:
-      str: A BigQuery datatype or UNKNOWN if it could not be determined.
+      dict: Schema of the exported file
   """
-  column_type = 'UNKNOWN'
-  if (value is None):
-    column_type = 'UNKNOWN'
-  if (isinstance(value, str)):
-    column_type = 'STRING'
-  elif (isinstance(value, int)):
-    column_type = 'INTEGER'
-  elif (isinstance(value, float)):
-    column_type = 'FLOAT'
-  elif (isinstance(value, bool)):
-    column_type = 'BOOLEAN'
-
-  if (last_type and last_type != column_type):
-    if (last_type == 'STRING'):
-      column_type = 'STRING'
-    elif (last_type == 'FLOAT' and column_type == 'INTEGER'):
-      column_type = 'FLOAT'
-
-  return column_type
+  schema = {}
+  string_columns = set()
+  schema_get = schema.get
+  type_codes_get = type_codes.get
+  dumps = orjson.dumps
+  geometry_column = columns.get('geometry')
+  geojson_column = columns.get('geojson')
+  geojson_geometry_column = columns.get('geojson_geometry')
+  has_geometry_text = (
+    geometry_column is not None or geojson_geometry_column is not None)
+
+  # Rows are written by a separate thread, so writing to disk overlaps with
+  # reading and converting the next features. The queue is bounded so only a
+  # few chunks of rows are held in memory at a time.
+  write_queue = queue.Queue(maxsize=max_queued_chunks)
+  write_errors = []
+  with open(output_filepath, 'wb', buffering=file_buffer_size) as json_file:
+    writer = threading.Thread(
+      target=write_from_queue,
+      args=(json_file, write_queue, write_errors)
+    )
+    writer.start()
+    try:
+      lines = []
+      for line_item in features:
+        row = {}
+        # GeoJSON allows the properties member to be null.
+        properties = line_item.get('properties') or {}
+
+        for key, value in properties.items():
+          row[key] = value
+
+          # STRING holds any value, so once a column reaches it there is
+          # nothing left to detect.
+          if key in string_columns:
+            continue
+
+          # A column's type has to hold the values from every row, which is
+          # the largest type code seen for it.
+          type_code = type_codes_get(type(value), 0)
+          if type_code > schema_get(key, -1):
+            schema[key] = type_code
+            if type_code == string_type_code:
+              string_columns.add(key)
+
+        # Serialize the geometry once, and splice it into the feature as a
+        # Fragment when the geojson column is also wanted.
+        if has_geometry_text:
+          geometry_json = dumps(line_item['geometry'])
+          geometry_text = geometry_json.decode()
+          if geometry_column is not None:
+            row[geometry_column] = geometry_text
+          if geojson_geometry_column is not None:
+            row[geojson_geometry_column] = geometry_text
+          if geojson_column is not None:
+            line_item['geometry'] = orjson.Fragment(geometry_json)
+        if geojson_column is not None:
+          row[geojson_column] = dumps(line_item).decode()
+
+        lines.append(dumps(row, option=orjson.OPT_APPEND_NEWLINE))
+        if len(lines) == rows_per_chunk:
+          # Stop converting as soon as a write has failed.
+          if write_errors:
+            break
+          write_queue.put(b''.join(lines))
+          lines = []
+
+      if lines and not write_errors:
+        write_queue.put(b''.join(lines))
+    finally:
+      write_queue.put(None)
+      writer.join()
+
+  if write_errors:
+    raise write_errors[0]
+
+  schema = {key: type_labels[type_code] for key, type_code in schema.items()}
+  if geometry_column is not None:
+      schema[geometry_column] = 'GEOGRAPHY'
+  if geojson_column is not None:
+      schema[geojson_column] = 'STRING'
+  if geojson_geometry_column is not None:
+      schema[geojson_geometry_column] = 'STRING'
+
+  return schema
+
+
+def write_from_queue(
+    file: BinaryIO,
+    write_queue: queue.Queue,
+    errors: list) -> None:
+  """Write chunks of bytes from a queue to a file until None is received.
+
+  Intended to be the target of the writer thread in features_to_ndjson(). If a
+  write fails, the exception is appended to errors and the remaining chunks are
+  discarded, so the thread filling the queue is never blocked.
+
+  Args:
+      file (BinaryIO): File opened in binary mode to write to
+      write_queue (queue.Queue): Queue of bytes to write, ending with None
+      errors (list): List to append an exception to if a write fails
+  """
+  while True:
+    chunk = write_queue.get()
+    if chunk is None:
+      return
+    if errors:
+      continue
+    try:
+      file.write(chunk)
+    except Exception as err:
+      errors.append(err)
 
 
 def convert_to_ndjson(
@@ -650,8 +1053,9 @@ def convert_to_ndjson(
   """Convert to newline delimited JSON, return the output filepath and schema.
 
   If the input file is not encoded as GeoJSONSeq with a WGS84 reference system
-  then a temporary file of that type will be created and used to convert to
-  newline delimited JSON.
+  then its features are read with OGR and transformed to WGS84 while they are
+  converted. A temporary GeoJSONSeq file is only created with VectorTranslate
+  when there are convert_options, or the file should be kept.
 
   Args:
       input_filepath (str): Path to features file
@@ -662,8 +1066,8 @@ def convert_to_ndjson(
         features in. See geojson_to_ndjson() for more info. Defaults to None.
       convert_options (str | None, optional): Options to pass to gdal. See
         convert_to_wgs84_geojsonseq() For more info. Defaults to None.
-      do_keep_geojsonseq (bool | None, optional): Does not delete the
-        intermediary GeoJSONSeq files. Defaults to False.
+      do_keep_geojsonseq (bool | None, optional): Creates an intermediary
+        GeoJSONSeq file and does not delete it. Defaults to False.
       output_directory (str | None, optional): Path to the directory to save
         the converted file to. If omitted, the file will be saved in the
         source directory. Defaults to None.
@@ -682,20 +1086,41 @@ def convert_to_ndjson(
       output_directory=output_directory
     )
 
-  schema = None
-  temp_filepath = None
-  if convert_options or not is_wgs84_geojsonseq( input_filepath ):
-    temp_filepath = get_output_filepath(
-      os.path.splitext(output_filepath)[0] + '_GeoJSONSeq',
-      '.geojson',
-      False,
-      output_directory=output_directory
-    )
-    convert_to_wgs84_geojsonseq(input_filepath, temp_filepath, convert_options)
-    input_filepath = temp_filepath
+  # Open the file at most once, and use the dataset for every step that needs
+  # it. Reading its first bytes is usually enough to tell if it is GeoJSONSeq.
+  ds = None
+  if not convert_options:
+    is_geojsonseq = sniff_wgs84_geojsonseq(input_filepath)
+    if is_geojsonseq is None:
+      ds = gdal.OpenEx(input_filepath, gdal.OF_VECTOR)
+      is_geojsonseq = is_wgs84_geojsonseq(ds)
+
+    if is_geojsonseq:
+      ds = None
+      schema = geojson_to_ndjson(input_filepath, output_filepath, columns=columns)
+      return output_filepath, schema
+
+  if ds is None:
+    ds = gdal.OpenEx(input_filepath, gdal.OF_VECTOR)
+
+  if not convert_options and not do_keep_geojsonseq:
+    schema = ogr_to_ndjson(ds, output_filepath, columns=columns)
+    ds = None
+    return output_filepath, schema
+
+  # Options for VectorTranslate, and keeping the GeoJSONSeq file, require it to
+  # be created.
+  temp_filepath = get_output_filepath(
+    get_path_parts(output_filepath)['path_root'] + '_GeoJSONSeq',
+    '.geojson',
+    False,
+    output_directory=output_directory
+  )
+  convert_to_wgs84_geojsonseq(ds, temp_filepath, convert_options)
+  ds = None
 
-  schema = geojson_to_ndjson(input_filepath, output_filepath, columns=columns)
-  if temp_filepath and not do_keep_geojsonseq:
+  schema = geojson_to_ndjson(temp_filepath, output_filepath, columns=columns)
+  if not do_keep_geojsonseq:
     os.remove(temp_filepath)
 
   return output_filepath, schema
@@ -705,7 +1130,8 @@ def get_output_filepath(
     source_filepath: str,
     extension: str,
     can_overwrite: bool | None = False,
-    output_directory: str | None = None) -> str:
+    output_directory: str | None = None,
+    reserved_filepaths: set | None = None) -> str:
   """Build an output filepath using a source filepath and an extension.
 
   Args:
@@ -716,6 +1142,8 @@ def get_output_filepath(
         get_safe_filepath() for more info). Defaults to False.
       output_directory (str | None, optional): The directory for the output
         filepath, if different than the source. Defaults to None.
+      reserved_filepaths (set | None, optional): Filepaths that can't be chosen.
+        See get_safe_filepath() for more info. Defaults to None.
 
   Returns:
       str: Full path for the output file.
@@ -723,37 +1151,59 @@ def get_output_filepath(
   source = get_path_parts(source_filepath)
   output_directory = output_directory or os.path.dirname(source_filepath)
   filepath = os.path.join( output_directory, source['filename_root'] + extension )
-  return get_safe_filepath(filepath, can_overwrite)
+  return get_safe_filepath(
+    filepath,
+    can_overwrite,
+    reserved_filepaths=reserved_filepaths
+  )
+
+
+def get_schema_filepath(
+    output_filepath: str,
+    can_overwrite: bool | None = False,
+    reserved_filepaths: set | None = None) -> str:
+  """Build the filepath of the schema file for a converted file.
+
+  Args:
+      output_filepath (str): Path of the converted file
+      can_overwrite (bool | None, optional): Whether it is ok to overwrite an
+        existing file. If False, a unique name will be chosen (see
+        get_safe_filepath() for more info). Defaults to False.
+      reserved_filepaths (set | None, optional): Filepaths that can't be chosen.
+        See get_safe_filepath() for more info. Defaults to None.
+
+  Returns:
+      str: Full path for the schema file.
+  """
+  return get_safe_filepath(
+    get_path_parts(output_filepath)['path_root'] + '_SCHEMA.json',
+    can_overwrite,
+    reserved_filepaths=reserved_filepaths
+  )
 
 
 def convert_to_wgs84_geojsonseq(
-    input_filepath: str,
+    ds: gdal.Dataset,
     output_filepath: str,
     options:str | None = '') -> None:
   """Convert a geographic features file to a GeoJSON file
 
   Args:
-      input_filepath (str): Path to the features file
+      ds (gdal.Dataset): The features file, opened with gdal.OpenEx()
       output_filepath (str): Path to save the GeoJSON file to.
       options (str | None, optional): String containing options to pass to gdal.
         This will be appended to "-f GeoJSONSeq -t_srs crs:84". Defaults to
         empty string.
   """
-  print(f'Converting {input_filepath} to GeoJSONSeq and saving to {output_filepath}...')
-  gdal.UseExceptions()
-  ds = gdal.OpenEx(input_filepath)
+  print(f'Converting {ds.GetDescription()} to GeoJSONSeq and saving to {output_filepath}...')
   gdal.VectorTranslate(
     output_filepath,
     ds,
-    options='-f GeoJSONSeq -t_srs crs:84 ' + options
+    options='-f GeoJSONSeq -t_srs crs:84 ' + (options or '')
   )
-  ds = None
 
 
-def save_schema(
-    schema: dict,
-    path_root: str,
-    can_overwrite: bool | None = False) -> None:
+def save_schema(schema: dict, json_filepath: str) -> None:
   """Save the schema as a JSON file.
 
   The schema file can be used to specify a BigQuery table's schema
@@ -762,30 +1212,23 @@ def save_schema(
 
   Args:
       schema (dict): Schema
-      path_root (str): The directory path and basename to save the schema to.
-      can_overwrite (bool | None, optional): Whether to overwrite existing files.
-        If not, a unique name will be chosen (see get_safe_filepath() for more
-        info). Defaults to False.
+      json_filepath (str): Path to save the schema to. See
+        get_schema_filepath().
   """
-  unknown_columns = []
-  json_schema = []
-  for name, datatype in schema.items():
-    if (datatype == 'UNKNOWN'):
-      unknown_columns.append(name)
+  json_schema = [
+    {'name': name, 'type': datatype} for name, datatype in schema.items()
+  ]
+  unknown_columns = [
+    name for name, datatype in schema.items() if datatype == 'UNKNOWN'
+  ]
 
-    json_schema.append({'name':name, 'type': datatype})
-
-  json_filepath = get_safe_filepath(
-    path_root  + '_SCHEMA.json',
-    can_overwrite
-  )
   print((
     f'Saving schema file to {json_filepath}. You can use it to define a '
     'BigQuery table\'s schema programmatically or in the BigQuery Console.\n'
     'See: https://cloud.google.com/bigquery/docs/schemas#specify_schemas'
   ))
-  with open(json_filepath, 'w+') as json_file:
-    json.dump(json_schema, json_file)
+  with open(json_filepath, 'wb') as json_file:
+    json_file.write(orjson.dumps(json_schema, option=orjson.OPT_INDENT_2))
 
   if len(unknown_columns) > 0:
     print((